@@ -2,21 +2,75 @@
 Flask Backend for Animal Conservation Risk Prediction
 FIXED VERSION: Works with regenerated models
 Connects trained ML models to React frontend
+
+Production:
+    gunicorn -w $(nproc) -b 0.0.0.0:5000 --preload flaskbackend:app
+
+--preload loads the models once in the master so forked workers share
+the forest pages. Keep the default sync workers: prediction is CPU-bound.
 """
 
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 import numpy as np
+import orjson
 import joblib
 import logging
 from typing import Dict, Any, Optional
 import os
+import sys
+import threading
+import functools
+import gc
+
+# Optional: serve the forest through onnxruntime when an ONNX export exists
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+# Optional: serve the forest as compiled native code when a tl2cgen library exists
+try:
+    import tl2cgen
+except ImportError:
+    tl2cgen = None
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Optional: JIT-compile the feature scaling loop
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Configure logging (WARNING by default; LOG_LEVEL=DEBUG traces each request)
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'WARNING').upper())
 logger = logging.getLogger(__name__)
 
+
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider backed by orjson
+    Serializes numpy scalars/arrays from predict_proba without float() casts
+    """
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Skip the bytes -> str -> bytes round trip that dumps() would add
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=self.option),
+            mimetype='application/json'
+        )
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Enable CORS for React frontend
 CORS(app, resources={
@@ -27,31 +81,165 @@ CORS(app, resources={
     }
 })
 
+# Request fields, in training feature order
+NUM_FIELDS = ('population_size', 'life_span', 'top_speed', 'weight', 'height', 'length')
+CAT_FIELD_COLUMNS = (
+    ('class_category', 'Class_Category'),
+    ('diet_type', 'Diet_Type'),
+    ('size_category', 'Size_Category'),
+    ('population_risk', 'Population_Risk')
+)
+CAT_FIELDS = tuple(field for field, _ in CAT_FIELD_COLUMNS)
+REQUIRED_FIELDS = NUM_FIELDS + CAT_FIELDS
+REQUIRED_SET = frozenset(REQUIRED_FIELDS)
+
 # Global variables for models
 models = None
 rf_model = None
 scaler = None
 le_target = None
 le_dict = None
+onnx_session = None
+native_predictor = None
 models_loaded = False
 
+# Lookup tables derived from the encoders at load time
+CAT_MAPS = None
+TARGET_CLASSES = None
+TARGET_CLASSES_LIST = None
+SCALER_MEAN = None
+SCALER_SCALE = None
+INFO_BODY = None
+TREE_JOBS = 1
+
+# Precomputed predictions for SAMPLE_ANIMALS, keyed by encoded feature tuple
+SAMPLE_INDEX = {}
+SAMPLE_RESULTS = []
+
+# Fitted attributes only used for training diagnostics, never for prediction
+TRAINING_ONLY_ATTRS = ('oob_decision_function_', 'oob_score_', 'oob_prediction_', 'estimators_samples_')
+
+# Prediction cost is linear in tree count; larger saved forests are trimmed
+MAX_TREES = 100
+
+# Per-row batch error for values that overflow once scaled (e.g. "inf", 1e300)
+NON_FINITE_ERROR = 'Non-finite or out-of-range numeric values'
+
+# Batches at least this large spread the forest across TREE_JOBS threads
+PARALLEL_BATCH_SIZE = 1000
+
+# Sample animals from animal_planet_cleaned.csv for the frontend cards
+SAMPLE_ANIMALS = [
+    {
+        'name': 'Grey Wolf', 'actual_status': 'Least Concern',
+        'population_size': 400000, 'life_span': 15, 'top_speed': 75,
+        'weight': 38, 'height': 0.825, 'length': 1.325,
+        'class_category': 'Mammalia', 'diet_type': 'Carnivore',
+        'size_category': 'Small', 'population_risk': 'Stable Population'
+    },
+    {
+        'name': 'Giant Panda', 'actual_status': 'Vulnerable',
+        'population_size': 1800, 'life_span': 25, 'top_speed': 32,
+        'weight': 115, 'height': 0.75, 'length': 1.55,
+        'class_category': 'Mammalia', 'diet_type': 'Herbivore',
+        'size_category': 'Medium', 'population_risk': 'Low Population'
+    },
+    {
+        'name': 'Polar Bear', 'actual_status': 'Vulnerable',
+        'population_size': 26500, 'life_span': 27.5, 'top_speed': 40,
+        'weight': 475, 'height': 1.6, 'length': 2.15,
+        'class_category': 'Mammalia', 'diet_type': 'Carnivore',
+        'size_category': 'Medium', 'population_risk': 'Moderate Population'
+    },
+    {
+        'name': 'Cheetah', 'actual_status': 'Vulnerable',
+        'population_size': 6674, 'life_span': 15, 'top_speed': 112,
+        'weight': 46.5, 'height': 0.8, 'length': 1.31,
+        'class_category': 'Mammalia', 'diet_type': 'Carnivore',
+        'size_category': 'Small', 'population_risk': 'Low Population'
+    },
+    {
+        'name': 'Snow Leopard', 'actual_status': 'Endangered',
+        'population_size': 3048, 'life_span': 18, 'top_speed': 88,
+        'weight': 41, 'height': 0.6, 'length': 1.125,
+        'class_category': 'Mammalia', 'diet_type': 'Carnivore',
+        'size_category': 'Small', 'population_risk': 'Low Population'
+    },
+    {
+        'name': 'Black Rhinoceros', 'actual_status': 'Critically Endangered',
+        'population_size': 4940, 'life_span': 39.5, 'top_speed': 50,
+        'weight': 1100, 'height': 1.6, 'length': 3.4,
+        'class_category': 'Mammalia', 'diet_type': 'Herbivore',
+        'size_category': 'Large', 'population_risk': 'Low Population'
+    },
+    {
+        'name': 'Sumatran Orangutan', 'actual_status': 'Critically Endangered',
+        'population_size': 7300, 'life_span': 42.5, 'top_speed': 6,
+        'weight': 67.5, 'height': 1.15, 'length': 1.55,
+        'class_category': 'Mammalia', 'diet_type': 'Herbivore',
+        'size_category': 'Small', 'population_risk': 'Low Population'
+    },
+    {
+        'name': 'Giraffe', 'actual_status': 'Vulnerable',
+        'population_size': 97562, 'life_span': 28, 'top_speed': 48,
+        'weight': 1250, 'height': 4.35, 'length': 4.25,
+        'class_category': 'Mammalia', 'diet_type': 'Herbivore',
+        'size_category': 'Large', 'population_risk': 'Moderate Population'
+    }
+]
+
+# Static content, so serialize it once
+ANIMALS_BODY = orjson.dumps(SAMPLE_ANIMALS)
+
+# Per-thread scratch buffers for single predictions
+_buffers = threading.local()
+
+
+def get_feature_buffers():
+    """
+    Return this thread's (1, 10) raw and scaled feature buffers and its
+    float64 scratch row for scaling
+    """
+    if not hasattr(_buffers, 'raw'):
+        _buffers.raw = np.empty((1, 10), dtype=np.float64)
+        _buffers.scaled = np.empty((1, 10), dtype=np.float32)
+        _buffers.scratch = np.empty(10, dtype=np.float64)
+    return _buffers.raw, _buffers.scaled, _buffers.scratch
+
+
+if njit is not None:
+    @njit(cache=True)
+    def scale_into(out, vals, mean, scale, scratch):
+        """Write (vals - mean) / scale into out (scratch is unused here)"""
+        for i in range(vals.shape[0]):
+            out[i] = (vals[i] - mean[i]) / scale[i]
+else:
+    def scale_into(out, vals, mean, scale, scratch):
+        """Write (vals - mean) / scale into out, using scratch for the float64 difference"""
+        np.subtract(vals, mean, out=scratch)
+        np.divide(scratch, scale, out=out)
+
 
 def load_models():
     """
     Load trained models from pickle file
     """
-    global models, rf_model, scaler, le_target, le_dict, models_loaded
+    global models, rf_model, scaler, le_target, le_dict, onnx_session, native_predictor, models_loaded
+    global CAT_MAPS, TARGET_CLASSES, TARGET_CLASSES_LIST, SCALER_MEAN, SCALER_SCALE, INFO_BODY, TREE_JOBS
     
     try:
-        model_path = 'C:\\Users\\agiov\\DS3010Final\\backend\\animal_conservation_models.pkl'
+        model_path = os.environ.get('MODEL_PATH') or os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), 'animal_conservation_models.pkl'
+        )
         
         if not os.path.exists(model_path):
             logger.error(f"❌ Model file not found at {model_path}")
-            logger.error("Make sure animal_conservation_models.pkl is in the same directory as this script")
+            logger.error("Put animal_conservation_models.pkl next to this script or set MODEL_PATH")
             return False
         
         logger.info(f"Loading models from {model_path}...")
-        models = joblib.load(model_path)
+        # Read-only memory map: forked workers share the array pages
+        models = joblib.load(model_path, mmap_mode='r')
         
         rf_model = models.get('rf_model')
         scaler = models.get('scaler')
@@ -62,6 +250,102 @@ def load_models():
             logger.error("❌ Missing required model components")
             return False
         
+        # The compiled exports below hold the whole saved forest, so they
+        # can't be used once it's trimmed: every backend must agree
+        trimmed = len(rf_model.estimators_) > MAX_TREES
+        if trimmed:
+            logger.warning(
+                f"Trimming forest from {len(rf_model.estimators_)} to {MAX_TREES} trees; "
+                "ignoring any ONNX/compiled exports of the untrimmed forest"
+            )
+            rf_model.estimators_ = rf_model.estimators_[:MAX_TREES]
+            rf_model.n_estimators = MAX_TREES
+        
+        # Compiled forest from the notebook's ONNX export cell, if available
+        onnx_path = os.path.join(os.path.dirname(model_path), 'animal_conservation_rf.onnx')
+        if ort is not None and not trimmed and os.path.exists(onnx_path):
+            onnx_session = ort.InferenceSession(onnx_path, providers=['CPUExecutionProvider'])
+            logger.info(f"✓ Using ONNX forest from {onnx_path}")
+        else:
+            onnx_session = None
+        
+        # Forest compiled to C by the notebook's treelite cell, if available
+        native_path = os.path.join(os.path.dirname(model_path), 'animal_conservation_rf.so')
+        if tl2cgen is not None and not trimmed and os.path.exists(native_path):
+            native_predictor = tl2cgen.Predictor(native_path, nthread=1)
+            logger.info(f"✓ Using compiled forest from {native_path}")
+        else:
+            native_predictor = None
+        
+        # Shrink the working set: keep only what inference touches. The
+        # artifacts also hold the GB/LR/SVM/KNN comparison models
+        for estimator in [rf_model, *rf_model.estimators_]:
+            for attr in TRAINING_ONLY_ATTRS:
+                estimator.__dict__.pop(attr, None)
+        models = {
+            'rf_model': rf_model,
+            'scaler': scaler,
+            'le_target': le_target,
+            'le_dict': le_dict
+        }
+        
+        # n_jobs=None runs single-threaded unless a joblib context says
+        # otherwise, so only large batches pay for thread dispatch. Multi-worker
+        # Gunicorn already uses every core; BACKEND_PARALLEL=tree overrides
+        rf_model.n_jobs = None
+        under_gunicorn = 'gunicorn' in sys.modules or 'GUNICORN_CMD_ARGS' in os.environ
+        if os.environ.get('BACKEND_PARALLEL') == 'tree' or not under_gunicorn:
+            TREE_JOBS = max(1, (os.cpu_count() or 1) - 1)
+        else:
+            TREE_JOBS = 1
+        
+        # Plain dict lookups instead of LabelEncoder.transform on the hot path
+        CAT_MAPS = {
+            col: {c: i for i, c in enumerate(le.classes_)}
+            for col, le in le_dict.items()
+        }
+        TARGET_CLASSES = le_target.classes_
+        TARGET_CLASSES_LIST = TARGET_CLASSES.tolist()
+        
+        # Apply StandardScaler by hand to skip sklearn's input validation.
+        # Scale in float64 like sklearn, then hand the trees float32 (what
+        # they compare against anyway) so predict_proba makes no copy
+        SCALER_MEAN = scaler.mean_.astype(np.float64)
+        SCALER_SCALE = scaler.scale_.astype(np.float64)
+        
+        # Trigger JIT compilation now rather than on the first request
+        scale_into(
+            np.empty(10, dtype=np.float32),
+            np.zeros(10, dtype=np.float64),
+            SCALER_MEAN,
+            SCALER_SCALE,
+            np.empty(10, dtype=np.float64)
+        )
+        
+        # /api/info only changes when the models do
+        INFO_BODY = orjson.dumps({
+            'service': 'Animal Conservation Risk Prediction API',
+            'version': '2.0.0',
+            'status': 'healthy',
+            'endpoints': {
+                'POST /api/predict': 'Make a single prediction',
+                'POST /api/batch-predict': 'Make batch predictions',
+                'GET /api/animals': 'Get sample animals',
+                'GET /api/info': 'Get API information',
+                'GET /': 'Health check'
+            },
+            'valid_categories': {
+                'class_category': le_dict['Class_Category'].classes_.tolist(),
+                'diet_type': le_dict['Diet_Type'].classes_.tolist(),
+                'size_category': le_dict['Size_Category'].classes_.tolist(),
+                'population_risk': le_dict['Population_Risk'].classes_.tolist()
+            },
+            'target_classes': le_target.classes_.tolist(),
+            'models_loaded': True
+        })
+        
+        _predict_cached.cache_clear()
+        cache_sample_predictions()
         models_loaded = True
         logger.info("✓ Models loaded successfully!")
         logger.info(f"✓ Target classes: {le_target.classes_}")
@@ -72,16 +356,87 @@ def load_models():
         return False
 
 
+def scale_features(features):
+    """
+    Standardize a float64 (n, 10) matrix in place and return it as float32
+    """
+    features -= SCALER_MEAN
+    features /= SCALER_SCALE
+    return features.astype(np.float32)
+
+
+def predict_proba(features_scaled):
+    """
+    Class probabilities for scaled features, columns ordered as rf_model.classes_
+    Uses the compiled forest or ONNX session when loaded, otherwise sklearn
+    """
+    if native_predictor is not None:
+        probabilities = native_predictor.predict(tl2cgen.DMatrix(features_scaled))
+        return probabilities.reshape(len(features_scaled), -1)
+    if onnx_session is not None:
+        _, probabilities = onnx_session.run(None, {'X': features_scaled.astype(np.float32, copy=False)})
+        return probabilities
+    return rf_model.predict_proba(features_scaled)
+
+
+def cache_sample_predictions():
+    """
+    Score SAMPLE_ANIMALS in one call so predict can answer them from a dict
+    """
+    global SAMPLE_INDEX, SAMPLE_RESULTS
+    
+    raw_rows = [
+        tuple(float(animal[f]) for f in NUM_FIELDS)
+        + tuple(CAT_MAPS[col][animal[field]] for field, col in CAT_FIELD_COLUMNS)
+        for animal in SAMPLE_ANIMALS
+    ]
+    
+    # One contiguous (n, 10) matrix instead of a dict per animal
+    sample_features = scale_features(np.asarray(raw_rows, dtype=np.float64))
+    sample_proba = predict_proba(sample_features)
+    predictions = rf_model.classes_[sample_proba.argmax(axis=1)]
+    
+    SAMPLE_RESULTS = [
+        (TARGET_CLASSES_LIST[prediction], probabilities.max(), tuple(probabilities))
+        for prediction, probabilities in zip(predictions, sample_proba)
+    ]
+    SAMPLE_INDEX = {row: i for i, row in enumerate(raw_rows)}
+
+
+@functools.lru_cache(maxsize=4096)
+def _predict_cached(population_size, life_span, top_speed, weight, height, length,
+                    class_encoded, diet_encoded, size_encoded, pop_risk_encoded):
+    """
+    Scale and score one encoded feature vector (same order as training)
+    Repeated animals are served from the cache instead of the forest
+    
+    Returns (risk_category, confidence, probabilities)
+    """
+    features, features_scaled, scratch = get_feature_buffers()
+    features[0] = (
+        population_size, life_span, top_speed, weight, height, length,
+        class_encoded, diet_encoded, size_encoded, pop_risk_encoded
+    )
+    
+    # Scale features
+    scale_into(features_scaled[0], features[0], SCALER_MEAN, SCALER_SCALE, scratch)
+    
+    # Make prediction (predict() would traverse the forest a second time)
+    probabilities = predict_proba(features_scaled)[0]
+    prediction = int(rf_model.classes_[probabilities.argmax()])
+    return TARGET_CLASSES_LIST[prediction], probabilities.max(), tuple(probabilities)
+
+
 @app.route('/', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    status = 'healthy' if models_loaded else 'unhealthy'
+    # The process exits at import if the models fail to load
     return jsonify({
-        'status': status,
+        'status': 'healthy',
         'service': 'Animal Conservation Risk Prediction API',
         'version': '2.0.0',
-        'models_loaded': models_loaded
-    }), 200 if models_loaded else 503
+        'models_loaded': True
+    }), 200
 
 
 @app.route('/api/predict', methods=['POST'])
@@ -117,24 +472,12 @@ def predict():
     }
     """
     try:
-        if not models_loaded or rf_model is None:
-            logger.error("Models not loaded")
-            return jsonify({
-                'success': False,
-                'error': 'Models not loaded. Please restart the server with animal_conservation_models.pkl in the same directory.'
-            }), 503
-        
-        data = request.json
-        logger.info(f"Received prediction request for animal")
-        
-        # Validate required fields
-        required_fields = [
-            'population_size', 'life_span', 'top_speed', 'weight', 'height', 'length',
-            'class_category', 'diet_type', 'size_category', 'population_risk'
-        ]
+        data = request.get_json()
+        logger.debug("Received prediction request for animal")
         
-        missing_fields = [f for f in required_fields if f not in data]
-        if missing_fields:
+        # Validate required fields (single set operation on the happy path)
+        if not REQUIRED_SET.issubset(data):
+            missing_fields = [f for f in REQUIRED_FIELDS if f not in data]
             logger.warning(f"Missing fields: {missing_fields}")
             return jsonify({
                 'success': False,
@@ -143,14 +486,14 @@ def predict():
         
         # Extract and validate numeric features
         try:
-            numeric_features = [
+            numeric_features = (
                 float(data['population_size']),
                 float(data['life_span']),
                 float(data['top_speed']),
                 float(data['weight']),
                 float(data['height']),
                 float(data['length'])
-            ]
+            )
         except (ValueError, TypeError) as e:
             logger.warning(f"Invalid numeric values: {e}")
             return jsonify({
@@ -160,11 +503,11 @@ def predict():
         
         # Encode categorical features
         try:
-            class_encoded = le_dict['Class_Category'].transform([data['class_category']])[0]
-            diet_encoded = le_dict['Diet_Type'].transform([data['diet_type']])[0]
-            size_encoded = le_dict['Size_Category'].transform([data['size_category']])[0]
-            pop_risk_encoded = le_dict['Population_Risk'].transform([data['population_risk']])[0]
-        except ValueError as e:
+            class_encoded = CAT_MAPS['Class_Category'][data['class_category']]
+            diet_encoded = CAT_MAPS['Diet_Type'][data['diet_type']]
+            size_encoded = CAT_MAPS['Size_Category'][data['size_category']]
+            pop_risk_encoded = CAT_MAPS['Population_Risk'][data['population_risk']]
+        except (KeyError, TypeError) as e:
             logger.warning(f"Invalid categorical values: {e}")
             return jsonify({
                 'success': False,
@@ -175,33 +518,23 @@ def predict():
                          f'population_risk={list(le_dict["Population_Risk"].classes_)}'
             }), 400
         
-        # Create feature vector (same order as training)
-        features = np.array([[
+        features = (
             *numeric_features,
             class_encoded,
             diet_encoded,
             size_encoded,
             pop_risk_encoded
-        ]])
+        )
         
-        logger.info(f"Feature vector shape: {features.shape}")
+        # The frontend's sample cards hit this path with the same animals
+        sample = SAMPLE_INDEX.get(features)
+        if sample is not None:
+            prediction_label, confidence, probabilities = SAMPLE_RESULTS[sample]
+        else:
+            prediction_label, confidence, probabilities = _predict_cached(*features)
         
-        # Scale features
-        features_scaled = scaler.transform(features)
-        logger.info("Features scaled")
-        
-        # Make prediction
-        prediction = rf_model.predict(features_scaled)[0]
-        prediction_label = le_target.inverse_transform([prediction])[0]
-        logger.info(f"Prediction: {prediction_label}")
-        
-        # Get probabilities
-        probabilities = rf_model.predict_proba(features_scaled)[0]
-        confidence = float(max(probabilities))
-        prob_dict = {
-            label: float(prob)
-            for label, prob in zip(le_target.classes_, probabilities)
-        }
+        # Values stay numpy scalars; orjson serializes them directly
+        prob_dict = dict(zip(TARGET_CLASSES_LIST, probabilities))
         
         response = {
             'success': True,
@@ -210,7 +543,8 @@ def predict():
             'probabilities': prob_dict
         }
         
-        logger.info(f"Response: {response}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Response: {response}")
         return jsonify(response), 200
         
     except Exception as e:
@@ -236,13 +570,14 @@ def batch_predict():
     }
     """
     try:
-        if not models_loaded or rf_model is None:
+        # Batches can be large: parse the raw body with orjson, uncached
+        try:
+            data = orjson.loads(request.get_data(cache=False))
+        except orjson.JSONDecodeError as e:
             return jsonify({
                 'success': False,
-                'error': 'Models not loaded'
-            }), 503
-        
-        data = request.json
+                'error': f'Invalid JSON: {str(e)}'
+            }), 400
         
         if 'animals' not in data or not isinstance(data['animals'], list):
             return jsonify({
@@ -250,54 +585,83 @@ def batch_predict():
                 'error': 'Expected "animals" field containing a list of animal data'
             }), 400
         
-        logger.info(f"Processing batch of {len(data['animals'])} animals")
-        results = []
+        animals = data['animals']
+        logger.debug("Processing batch of %d animals", len(animals))
+        
+        # First pass: validate each animal, keeping per-row errors in place
+        results = [None] * len(animals)
+        names = []
+        rows = []
+        row_index = []
         
-        for idx, animal_data in enumerate(data['animals']):
+        for idx, animal_data in enumerate(animals):
+            names.append(animal_data.get('name', f'Animal {idx+1}'))
             try:
-                numeric_features = [
-                    float(animal_data['population_size']),
-                    float(animal_data['life_span']),
-                    float(animal_data['top_speed']),
-                    float(animal_data['weight']),
-                    float(animal_data['height']),
-                    float(animal_data['length'])
-                ]
-                
-                class_encoded = le_dict['Class_Category'].transform([animal_data['class_category']])[0]
-                diet_encoded = le_dict['Diet_Type'].transform([animal_data['diet_type']])[0]
-                size_encoded = le_dict['Size_Category'].transform([animal_data['size_category']])[0]
-                pop_risk_encoded = le_dict['Population_Risk'].transform([animal_data['population_risk']])[0]
-                
-                features = np.array([[
-                    *numeric_features,
-                    class_encoded,
-                    diet_encoded,
-                    size_encoded,
-                    pop_risk_encoded
-                ]])
-                
-                features_scaled = scaler.transform(features)
-                prediction = rf_model.predict(features_scaled)[0]
-                prediction_label = le_target.inverse_transform([prediction])[0]
-                probabilities = rf_model.predict_proba(features_scaled)[0]
+                row = [float(animal_data[f]) for f in NUM_FIELDS]
+                for field, col in CAT_FIELD_COLUMNS:
+                    value = animal_data[field]
+                    if value not in CAT_MAPS[col]:
+                        raise ValueError(f"Invalid {field}: {value!r}")
+                    row.append(CAT_MAPS[col][value])
                 
-                results.append({
-                    'animal': animal_data.get('name', f'Animal {idx+1}'),
-                    'risk_category': prediction_label,
-                    'confidence': float(max(probabilities)),
-                    'success': True
-                })
+                rows.append(row)
+                row_index.append(idx)
                 
             except Exception as e:
                 logger.warning(f"Error predicting animal {idx+1}: {e}")
-                results.append({
-                    'animal': animal_data.get('name', f'Animal {idx+1}'),
+                results[idx] = {
+                    'animal': names[idx],
                     'error': str(e),
                     'success': False
-                })
+                }
         
-        logger.info(f"Batch prediction complete: {len([r for r in results if r['success']])}/{len(results)} successful")
+        # Second pass: one scaler/forest call for every valid animal
+        if rows:
+            features = np.asarray(rows, dtype=np.float64)
+            
+            # Score each distinct animal once, then scatter back to every row
+            features, inverse = np.unique(features, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            
+            features = scale_features(features)
+            
+            # float() accepts "inf", and values like 1e300 overflow once scaled
+            # and cast to float32; fail just those rows instead of the whole batch
+            scorable = ~np.isinf(features).any(axis=1)
+            labels = np.full(len(features), None, dtype=object)
+            confidences = np.zeros(len(features))
+            
+            if scorable.any():
+                features = features[scorable]
+                if TREE_JOBS > 1 and len(features) >= PARALLEL_BATCH_SIZE:
+                    with joblib.parallel_backend('threading', n_jobs=TREE_JOBS):
+                        probabilities = predict_proba(features)
+                else:
+                    probabilities = predict_proba(features)
+                predictions = rf_model.classes_[probabilities.argmax(axis=1)]
+                labels[scorable] = TARGET_CLASSES[predictions]
+                confidences[scorable] = probabilities.max(axis=1)
+            
+            for i, idx in enumerate(row_index):
+                unique_row = inverse[i]
+                if scorable[unique_row]:
+                    results[idx] = {
+                        'animal': names[idx],
+                        'risk_category': labels[unique_row],
+                        'confidence': confidences[unique_row],
+                        'success': True
+                    }
+                else:
+                    logger.warning(f"Error predicting animal {idx+1}: {NON_FINITE_ERROR}")
+                    results[idx] = {
+                        'animal': names[idx],
+                        'error': NON_FINITE_ERROR,
+                        'success': False
+                    }
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            successful = sum(result['success'] for result in results)
+            logger.debug(f"Batch prediction complete: {successful}/{len(results)} successful")
         return jsonify({
             'success': True,
             'count': len(results),
@@ -315,33 +679,13 @@ def batch_predict():
 @app.route('/api/info', methods=['GET'])
 def get_info():
     """Get information about the API and valid categories"""
-    if not models_loaded:
-        return jsonify({
-            'service': 'Animal Conservation Risk Prediction API',
-            'version': '2.0.0',
-            'status': 'error',
-            'error': 'Models not loaded'
-        }), 503
-    
-    return jsonify({
-        'service': 'Animal Conservation Risk Prediction API',
-        'version': '2.0.0',
-        'status': 'healthy',
-        'endpoints': {
-            'POST /api/predict': 'Make a single prediction',
-            'POST /api/batch-predict': 'Make batch predictions',
-            'GET /api/info': 'Get API information',
-            'GET /': 'Health check'
-        },
-        'valid_categories': {
-            'class_category': list(le_dict['Class_Category'].classes_),
-            'diet_type': list(le_dict['Diet_Type'].classes_),
-            'size_category': list(le_dict['Size_Category'].classes_),
-            'population_risk': list(le_dict['Population_Risk'].classes_)
-        },
-        'target_classes': list(le_target.classes_),
-        'models_loaded': True
-    }), 200
+    return app.response_class(INFO_BODY, mimetype='application/json')
+
+
+@app.route('/api/animals', methods=['GET'])
+def get_animals():
+    """Get sample animals for the frontend"""
+    return app.response_class(ANIMALS_BODY, mimetype='application/json')
 
 
 @app.errorhandler(404)
@@ -362,20 +706,23 @@ def internal_error(error):
     }), 500
 
 
+logger.info("=" * 80)
+logger.info("Starting Animal Conservation Risk Prediction API")
+logger.info("=" * 80)
+
+# Load models at import time so Gunicorn workers (and --preload) get them.
+# Refuse to start without them rather than answer every request with 503
+models_loaded = load_models()
+if not models_loaded:
+    raise SystemExit(1)
+
+# Reclaim the dropped artifacts before serving (and before Gunicorn forks)
+gc.collect()
+logger.info("✓ API ready to make predictions!")
+
+
 if __name__ == '__main__':
-    logger.info("=" * 80)
-    logger.info("Starting Animal Conservation Risk Prediction API")
-    logger.info("=" * 80)
-    
-    # Load models on startup
-    models_loaded = load_models()
-    
-    if models_loaded:
-        logger.info("✓ API ready to make predictions!")
-    else:
-        logger.error("API starting WITHOUT models - predictions will fail")
-        logger.error("Make sure animal_conservation_models.pkl is in the same directory")
-    
+    # Development server only; use Gunicorn in production (see module docstring)
     logger.info(f"Server starting on http://0.0.0.0:5000")
     
     # Run Flask app